@@ -1,5 +1,23 @@
-import requests
+import asyncio
+import email.utils
 import json
+import math
+import mmap
+import os
+import sys
+import time
+
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 # Podstawowy adres URL zdefiniowany w swagger.json (serwer + endpoint)
 BASE_URL = "https://bdl.stat.gov.pl/api/v1/variables"
@@ -11,66 +29,249 @@ params = {
     'format': 'json'   # Format danych
 }
 
-def pobierz_wszystkie_zmienne():
-    wszystkie_zmienne = []
-    page = 0
+# Wymiary n1-n5 zdefiniowane w schemacie Variable
+NAME_KEYS = ('n1', 'n2', 'n3', 'n4', 'n5')
+
+# Maksymalna liczba jednoczesnych zapytań do API
+MAKS_ROWNOLEGLYCH = 10
+
+# Anonimowy dostęp do BDL pozwala na 5 zapytań na sekundę
+ZAPYTAN_NA_SEKUNDE = 5.0
+
+# Liczba prób pobrania strony, gdy API odpowiada 429 Too Many Requests
+MAKS_PROB = 5
+
+def pelna_nazwa(var):
+    """Łączy niepuste wymiary n1-n5 zmiennej w jedną nazwę"""
+    return " - ".join(v for v in map(var.get, NAME_KEYS) if v)
+
+
+def kanonizuj_zmienna(var, kanon):
+    """Przebudowuje rekord z internowanymi kluczami i współdzielonymi wartościami
     
+    Równe napisy (np. nazwy jednostek miary, ID tematów) ze wszystkich stron
+    trafiają do słownika `kanon` i wskazują na jeden obiekt w pamięci.
+    """
+    return {
+        sys.intern(k): kanon.setdefault(v, v) if isinstance(v, str) else v
+        for k, v in var.items()
+    }
+
+
+def wczytaj_json(dane):
+    """Parsuje odpowiedź JSON (orjson, jeśli jest dostępny)"""
+    if orjson is not None:
+        return orjson.loads(dane)
+    return json.loads(dane)
+
+
+def zapisz_bajty(sciezka, dane):
+    """Zapisuje cały bufor do pliku jednym kopiowaniem przez mmap"""
+    with open(sciezka, 'w+b') as f:
+        if not dane:
+            return
+        os.ftruncate(f.fileno(), len(dane))
+        with mmap.mmap(f.fileno(), len(dane), access=mmap.ACCESS_WRITE) as mm:
+            mm[:] = dane
+            mm.flush()
+
+
+def serializuj_json(obj, wciecia=True):
+    """Serializuje obiekt do JSON w UTF-8 (orjson, jeśli jest dostępny)"""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS pozwala zapisać słownik indeksowany liczbowym ID
+        opcje = orjson.OPT_NON_STR_KEYS
+        if wciecia:
+            opcje |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=opcje)
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        indent=2 if wciecia else None,
+        separators=None if wciecia else (',', ':'),
+    ).encode('utf-8')
+
+
+def zapisz_json(sciezka, obj, wciecia=True):
+    """Zapisuje obiekt jako JSON"""
+    zapisz_bajty(sciezka, serializuj_json(obj, wciecia))
+
+
+def zapisz_json_zst(sciezka, obj):
+    """Zapisuje obiekt jako zwarty JSON skompresowany wielowątkowo zstd"""
+    kompresor = zstandard.ZstdCompressor(level=3, threads=-1)
+    with open(sciezka, 'wb') as f, kompresor.stream_writer(f) as w:
+        w.write(serializuj_json(obj, wciecia=False))
+
+
+def czas_oczekiwania(response):
+    """Zwraca liczbę sekund z nagłówka Retry-After (domyślnie 1 s)"""
+    wartosc = response.headers.get('Retry-After')
+    if wartosc is None:
+        return 1.0
+    try:
+        return max(float(wartosc), 0.0)
+    except ValueError:
+        pass
+    # Retry-After może też zawierać datę HTTP
     try:
-        while True:
-            params['page'] = page
+        return max(email.utils.parsedate_to_datetime(wartosc).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+class Ogranicznik:
+    """Rozkłada zapytania w czasie, aby nie przekroczyć limitu na sekundę"""
+    
+    def __init__(self, na_sekunde):
+        self.odstep = 1.0 / na_sekunde
+        self._nastepny = 0.0
+        self._blokada = asyncio.Lock()
+    
+    async def czekaj(self):
+        """Czeka na najbliższy wolny termin wysłania zapytania"""
+        async with self._blokada:
+            teraz = time.monotonic()
+            if self._nastepny > teraz:
+                await asyncio.sleep(self._nastepny - teraz)
+                teraz = self._nastepny
+            self._nastepny = teraz + self.odstep
+
+
+def zapisz_linie_json(f, rekordy):
+    """Dopisuje rekordy do otwartego binarnie pliku JSON Lines"""
+    for rekord in rekordy:
+        if orjson is not None:
+            f.write(orjson.dumps(rekord))
+        else:
+            f.write(json.dumps(rekord, ensure_ascii=False).encode('utf-8'))
+        f.write(b'\n')
+
+
+async def pobierz_strone(client, semafor, ogranicznik, page):
+    """Pobiera pojedynczą stronę listy zmiennych
+    
+    Odpowiedź 429 jest ponawiana po czasie podanym w nagłówku Retry-After.
+    """
+    for proba in range(1, MAKS_PROB + 1):
+        async with semafor:
+            await ogranicznik.czekaj()
             print(f"Pobieranie strony {page}...")
-            
-            response = requests.get(BASE_URL, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = data.get('results', [])
-            
-            if not results:
-                break
-            
-            wszystkie_zmienne.extend(results)
-            
-            total_records = data.get('totalRecords', 0)
-            print(f"Pobrano {len(wszystkie_zmienne)} z {total_records} zmiennych")
-            
-            # Sprawdź czy są jeszcze strony
-            if len(wszystkie_zmienne) >= total_records:
-                break
-            
-            page += 1
+            response = await client.get(BASE_URL, params={**params, 'page': page})
+        if response.status_code == 429 and proba < MAKS_PROB:
+            opoznienie = czas_oczekiwania(response)
+            print(f"⏳ Limit zapytań przekroczony (strona {page}), ponowienie za {opoznienie:.1f} s")
+            await asyncio.sleep(opoznienie)
+            continue
+        response.raise_for_status()
+        return wczytaj_json(response.content)
+
+
+async def pobierz_wszystkie_zmienne(kompresja_zst=False):
+    """Pobiera wszystkie zmienne BDL i zapisuje je do plików wynikowych
+    
+    Z kompresja_zst=True (opcja --zst) zapisywana jest dodatkowo kopia
+    gus-variables.json.zst; wymaga pakietu zstandard.
+    """
+    zmienne_dict = {}
+    
+    try:
+        with open('gus-variables.jsonl', 'wb') as jsonl:
+            async with httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=20),
+            ) as client:
+                semafor = asyncio.Semaphore(MAKS_ROWNOLEGLYCH)
+                ogranicznik = Ogranicznik(ZAPYTAN_NA_SEKUNDE)
+                page_size = params['page-size']
+                pobrane = 0
+                kanon = {}
+                
+                def przetworz_strone(page, data):
+                    # Każda strona trafia od razu do pliku JSONL, słownika po ID
+                    # i do własnego miejsca w liście wynikowej; surowa strona
+                    # nie jest dalej przechowywana
+                    nonlocal pobrane
+                    results = [kanonizuj_zmienna(var, kanon) for var in data.get('results', [])]
+                    zapisz_linie_json(jsonl, results)
+                    for var in results:
+                        zmienne_dict[var['id']] = var
+                    start = page * page_size
+                    wszystkie_zmienne[start:start + len(results)] = results
+                    pobrane += len(results)
+                
+                # Pierwsza strona zwraca łączną liczbę rekordów
+                data = await pobierz_strone(client, semafor, ogranicznik, 0)
+                total_records = data.get('totalRecords', 0)
+                wszystkie_zmienne = [None] * total_records
+                przetworz_strone(0, data)
+                del data
+                print(f"Pobrano {pobrane} z {total_records} zmiennych")
+                
+                async def pobierz_i_przetworz(page):
+                    data = await pobierz_strone(client, semafor, ogranicznik, page)
+                    przetworz_strone(page, data)
+                
+                # Pozostałe strony pobieramy równolegle i przetwarzamy zaraz
+                # po nadejściu, więc w pamięci są tylko strony w trakcie pobierania
+                liczba_stron = math.ceil(total_records / page_size)
+                zadania = [
+                    asyncio.create_task(pobierz_i_przetworz(page))
+                    for page in range(1, liczba_stron)
+                ]
+                try:
+                    await asyncio.gather(*zadania)
+                except BaseException:
+                    # Błąd jednej strony przerywa pobieranie - pozostałe zadania
+                    # nie mogą dalej korzystać z zamykanego klienta
+                    for zadanie in zadania:
+                        zadanie.cancel()
+                    await asyncio.gather(*zadania, return_exceptions=True)
+                    raise
+                print(f"Pobrano {pobrane} z {total_records} zmiennych")
+        
+        # API mogło zwrócić mniej rekordów niż zapowiadało w totalRecords
+        if pobrane < total_records:
+            wszystkie_zmienne = [var for var in wszystkie_zmienne if var is not None]
         
         print(f"\n✅ Pobrano łącznie {len(wszystkie_zmienne)} zmiennych")
+        print("📄 Zapisano do pliku: gus-variables.jsonl")
         
         # Zapisz do pliku JSON
-        with open('gus-variables.json', 'w', encoding='utf-8') as f:
-            json.dump(wszystkie_zmienne, f, ensure_ascii=False, indent=2)
+        zapisz_json('gus-variables.json', wszystkie_zmienne)
         print("📄 Zapisano do pliku: gus-variables.json")
         
-        # Stwórz słownik zmiennych indeksowany po ID
-        zmienne_dict = {str(var['id']): var for var in wszystkie_zmienne}
+        # Skompresowana kopia kanonicznej listy tylko na życzenie
+        if kompresja_zst:
+            if zstandard is None:
+                print("⚠️ Pominięto gus-variables.json.zst: brak pakietu zstandard")
+            else:
+                zapisz_json_zst('gus-variables.json.zst', wszystkie_zmienne)
+                print("📄 Zapisano do pliku: gus-variables.json.zst")
         
-        # Zapisz słownik do pliku JSON
-        with open('gus-variables-dict.json', 'w', encoding='utf-8') as f:
-            json.dump(zmienne_dict, f, ensure_ascii=False, indent=2)
+        # Zapisz słownik do pliku JSON (bez wcięć - plik służy do wyszukiwania po ID)
+        zapisz_json('gus-variables-dict.json', zmienne_dict, wciecia=False)
         print("📄 Zapisano do pliku: gus-variables-dict.json")
         
         # Zapisz do pliku tekstowego (czytelny format)
-        with open('gus-variables.txt', 'w', encoding='utf-8') as f:
-            f.write(f"Lista zmiennych GUS BDL (łącznie: {len(wszystkie_zmienne)})\n")
-            f.write("=" * 80 + "\n\n")
-            
-            for var in wszystkie_zmienne:
-                # Łączenie wymiarów n1-n5 zdefiniowanych w schemacie Variable
-                pelna_nazwa = " - ".join(filter(None, [
-                    var.get('n1'), var.get('n2'), var.get('n3'), var.get('n4'), var.get('n5')
-                ]))
-                
-                f.write(f"ID: {var.get('id')}\n")
-                f.write(f"Nazwa: {pelna_nazwa}\n")
-                f.write(f"Jednostka miary: {var.get('measureUnitName')}\n")
-                f.write(f"Temat: {var.get('subjectId')}\n")
-                f.write("-" * 80 + "\n")
+        # Cały tekst składamy w pamięci i zapisujemy jednym kopiowaniem
+        fragmenty = [
+            f"Lista zmiennych GUS BDL (łącznie: {len(wszystkie_zmienne)})\n",
+            "=" * 80 + "\n\n",
+        ]
+        separator = "-" * 80 + "\n"
+        
+        for var in wszystkie_zmienne:
+            fragmenty.append(
+                f"ID: {var.get('id')}\n"
+                f"Nazwa: {pelna_nazwa(var)}\n"
+                f"Jednostka miary: {var.get('measureUnitName')}\n"
+                f"Temat: {var.get('subjectId')}\n"
+            )
+            fragmenty.append(separator)
+        
+        zapisz_bajty('gus-variables.txt', "".join(fragmenty).encode('utf-8'))
         
         print("📄 Zapisano do pliku: gus-variables.txt")
         
@@ -78,15 +279,12 @@ def pobierz_wszystkie_zmienne():
         print("\n📊 Przykładowe zmienne:")
         print("-" * 80)
         for var in wszystkie_zmienne[:5]:
-            pelna_nazwa = " - ".join(filter(None, [
-                var.get('n1'), var.get('n2'), var.get('n3'), var.get('n4'), var.get('n5')
-            ]))
-            print(f"ID: {var.get('id')} | {pelna_nazwa}")
+            print(f"ID: {var.get('id')} | {pelna_nazwa(var)}")
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"❌ Wystąpił błąd podczas połączenia: {e}")
     except Exception as e:
         print(f"❌ Wystąpił błąd: {e}")
 
 if __name__ == "__main__":
-    pobierz_wszystkie_zmienne()
+    asyncio.run(pobierz_wszystkie_zmienne(kompresja_zst='--zst' in sys.argv[1:]))
@@ -7,12 +7,23 @@ This server provides access to Polish statistical data through the Model Context
 """
 
 import asyncio
+import email.utils
+import hashlib
 import json
 import logging
-from typing import Any, Optional
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Union
 from urllib.parse import urlencode
 
 import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
@@ -28,58 +39,512 @@ logger = logging.getLogger("bdl-mcp-server")
 # BDL API Base URL
 BASE_URL = "https://bdl.stat.gov.pl/api/v1"
 
+# Cache lifetimes (seconds) for idempotent BDL GETs, matched by endpoint prefix.
+# Endpoints mapped to None (or not listed) are never cached.
+TOOL_CACHE_TTL: dict[str, Optional[float]] = {
+    "/data/": None,
+    "/aggregates": 3600.0,
+    "/attributes": 3600.0,
+    "/levels": 3600.0,
+    "/measures": 3600.0,
+    "/subjects": 3600.0,
+    "/years": 3600.0,
+    "/units": 300.0,
+    "/variables": 300.0,
+}
+# Maximum number of cached responses; least recently used entries are evicted
+CACHE_MAX_ENTRIES = 1024
+
+# Reference data that survives restarts in a persistent cache (requires diskcache)
+DISK_CACHE_DIR = os.environ.get("BDL_CACHE_DIR", os.path.expanduser("~/.cache/gus-bdl"))
+DISK_CACHE_TTL: dict[str, float] = {
+    "/aggregates": 7 * 86400.0,
+    "/attributes": 7 * 86400.0,
+    "/levels": 7 * 86400.0,
+    "/measures": 7 * 86400.0,
+    "/years": 7 * 86400.0,
+}
+
+# Token buckets (capacity, refill per second) pacing requests below the BDL
+# quotas; each prefix lists one bucket per quota window and a request takes a
+# token from all of them. The longest matching endpoint prefix wins and ""
+# must stay as the catch-all. Anonymous BDL access allows 5 requests per
+# second, 100 per 15 minutes, 1000 per 12 hours and 10000 per 7 days.
+RATE_LIMITS: dict[str, tuple[tuple[float, float], ...]] = {
+    "": (
+        (5.0, 5.0),
+        (100.0, 100.0 / 900),
+        (1000.0, 1000.0 / 43200),
+        (10000.0, 10000.0 / 604800),
+    ),
+}
+
+# Retries of a 429 Too Many Requests reply, honouring its Retry-After header;
+# longer waits are not retried so a tool call never stalls for minutes
+RATE_LIMIT_RETRIES = 3
+RETRY_AFTER_MAX = 30.0
+
+# Maximum number of HTTP requests the client sends to BDL at the same time
+MAX_CONCURRENT_REQUESTS = 16
+
+# Consecutive upstream failures (transport errors, 5xx) that open the circuit,
+# and seconds to fail fast before a single trial request is let through
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
+# Multi-variable data lookups are split into chunks of this many var-id values
+VAR_ID_CHUNK_SIZE = 50
+# Maximum number of chunk requests sent to BDL at the same time
+VAR_ID_CONCURRENCY = 8
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# Compressed response encodings httpx can decode; br needs the brotli package
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip"
+
 # Initialize MCP server
 server = Server("bdl-api")
 
 
+def json_loads(data: bytes) -> Any:
+    """Parse a JSON payload, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = True) -> str:
+    """Serialize a tool result as JSON, using orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+
+def text_content(obj: Any) -> TextContent:
+    """Wrap a tool result as MCP text content"""
+    return TextContent(type="text", text=json_dumps(obj))
+
+
+# Error payloads have a fixed shape, so only the escaped message is encoded
+ERROR_TEMPLATE = '{"error":%s}'
+
+
+def error_content(message: str) -> TextContent:
+    """Wrap an error message as MCP text content"""
+    return TextContent(type="text", text=ERROR_TEMPLATE % json_dumps(message, indent=False))
+
+
+def cache_ttl(endpoint: str) -> Optional[float]:
+    """Return the cache lifetime for an endpoint, or None if it must not be cached"""
+    for prefix, ttl in TOOL_CACHE_TTL.items():
+        if endpoint.startswith(prefix):
+            return ttl
+    return None
+
+
+def disk_cache_ttl(endpoint: str) -> Optional[float]:
+    """Return the persistent cache lifetime for an endpoint, or None if not persisted"""
+    for prefix, ttl in DISK_CACHE_TTL.items():
+        if endpoint.startswith(prefix):
+            return ttl
+    return None
+
+
+def retry_after(headers: httpx.Headers) -> float:
+    """Return the delay in seconds requested by a Retry-After header (default 1 s)"""
+    value = headers.get("Retry-After")
+    if value is None:
+        return 1.0
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    # Retry-After may also carry an HTTP date
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def cache_key(endpoint: str, params: dict) -> tuple:
+    """Build a hashable key from an endpoint and its query parameters"""
+    items = tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v) for k, v in params.items()
+    ))
+    return (endpoint, items)
+
+
+class TokenBucket:
+    """Asyncio-aware token bucket limiting the rate of outgoing requests"""
+    
+    __slots__ = ("capacity", "refill_per_sec", "_tokens", "_last", "_lock")
+    
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._last) * self.refill_per_sec
+                )
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.refill_per_sec)
+
+
+class CircuitBreaker:
+    """Fail fast while BDL is down instead of waiting out every timeout
+    
+    Closed: requests pass. Open: requests are refused until the cooldown
+    elapses. Half-open: one trial request decides whether to close again.
+    """
+    
+    __slots__ = ("threshold", "cooldown", "_failures", "_opened_at")
+    
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+    
+    def allow(self) -> bool:
+        """Return whether a request may be sent now"""
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at < self.cooldown:
+            return False
+        # Half-open: let this request through and keep refusing the rest
+        self._opened_at = now
+        return True
+    
+    def record_success(self):
+        self._failures = 0
+        self._opened_at = None
+    
+    def record_failure(self):
+        self._failures += 1
+        if self._failures >= self.threshold:
+            if self._opened_at is None:
+                logger.warning("BDL circuit opened after %d failures", self._failures)
+            self._opened_at = time.monotonic()
+
+
+# Returned without contacting BDL while the circuit is open
+UPSTREAM_UNAVAILABLE = {"error": "upstream unavailable"}
+
+
 class BDLClient:
     """HTTP client for BDL API"""
     
+    # Fixed attribute layout keeps hot-path lookups off a per-instance __dict__
+    __slots__ = (
+        "base_url",
+        "lang",
+        "client",
+        "_protocol_logged",
+        "_disk_cache",
+        "_cache",
+        "_inflight",
+        "_semaphore",
+        "_buckets",
+        "_breaker",
+    )
+    
     def __init__(self, base_url: str = BASE_URL, lang: str = "pl"):
         self.base_url = base_url
         self.lang = lang
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            headers={
-                "User-Agent": "BDL-MCP-Server/0.1.0",
-                "Accept": "application/json",
-            }
-        )
+        # Created on first use inside the running event loop, see get_client()
+        self.client: Optional[httpx.AsyncClient] = None
+        self._protocol_logged = False
+        # Opened on first use of a persisted endpoint, see get_disk_cache()
+        self._disk_cache = None
+        # key -> (expires_at, response), kept in least-recently-used order
+        self._cache: OrderedDict[tuple, tuple[float, Union[dict, bytes]]] = OrderedDict()
+        # key -> task currently fetching it, shared by identical requests
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        # Bursts of distinct lookups (e.g. many *_by_id calls) queue here
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._buckets = {
+            prefix: tuple(TokenBucket(capacity, refill) for capacity, refill in windows)
+            for prefix, windows in RATE_LIMITS.items()
+        }
+        self._breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN)
+    
+    def get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use"""
+        if self.client is None or self.client.is_closed:
+            # HTTP/2 lets concurrent tool calls share one keep-alive connection
+            self.client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_keepalive_connections=32,
+                    max_connections=64,
+                    keepalive_expiry=60.0,
+                ),
+                headers={
+                    "User-Agent": "BDL-MCP-Server/0.1.0",
+                    "Accept": "application/json",
+                    "Accept-Encoding": ACCEPT_ENCODING,
+                }
+            )
+        return self.client
+    
+    def _buckets_for(self, endpoint: str) -> tuple[TokenBucket, ...]:
+        """Return the rate-limit buckets for the longest matching endpoint prefix"""
+        prefix = max((p for p in self._buckets if endpoint.startswith(p)), key=len)
+        return self._buckets[prefix]
+    
+    def get_disk_cache(self):
+        """Return the persistent cache, or None if diskcache is not installed"""
+        if self._disk_cache is None and diskcache is not None:
+            self._disk_cache = diskcache.Cache(DISK_CACHE_DIR)
+        return self._disk_cache
     
     async def close(self):
-        await self.client.aclose()
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
     
     async def request(
         self,
         endpoint: str,
         params: Optional[dict] = None,
-        lang: Optional[str] = None
-    ) -> dict:
-        """Make a request to BDL API"""
-        if params is None:
-            params = {}
+        lang: Optional[str] = None,
+        dedupe: bool = True,
+        raw: bool = False
+    ) -> Union[dict, bytes]:
+        """Make a request to BDL API
+        
+        Identical concurrent requests share a single HTTP call unless
+        dedupe is False. With raw=True a successful uncached response is
+        returned as the undecoded JSON body; errors are always dicts.
+        """
+        # Filter out None values (httpx would send them as empty parameters)
+        # into a fresh dict, so the caller's params are never mutated
+        params = {k: v for k, v in params.items() if v is not None} if params else {}
         
         # Add language parameter
         params["lang"] = lang or self.lang
         params["format"] = "json"
         
-        # Filter out None values
-        params = {k: v for k, v in params.items() if v is not None}
+        key = cache_key(endpoint, params)
+        if raw:
+            key += ("raw",)
+        ttl = cache_ttl(endpoint)
+        
+        if ttl is not None:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._cache.move_to_end(key)
+                    return entry[1]
+                del self._cache[key]
+        
+        if not dedupe:
+            return self._remember(key, ttl, await self._fetch(endpoint, key, params, raw))
+        
+        # Identical concurrent requests wait for the one already in flight.
+        # The fetch runs in its own task and every caller awaits it through
+        # shield(), so cancelling one caller never cancels the others.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(endpoint, key, ttl, params, raw))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+        return await asyncio.shield(task)
+    
+    async def _load(
+        self,
+        endpoint: str,
+        key: tuple,
+        ttl: Optional[float],
+        params: dict,
+        raw: bool
+    ) -> Union[dict, bytes]:
+        """Fetch a response and cache it; run as the shared in-flight task"""
+        return self._remember(key, ttl, await self._fetch(endpoint, key, params, raw))
+    
+    def _forget_inflight(self, key: tuple, task: asyncio.Future):
+        """Drop a finished in-flight task so later requests fetch afresh"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+    
+    async def _fetch(
+        self,
+        endpoint: str,
+        key: tuple,
+        params: dict,
+        raw: bool = False
+    ) -> Union[dict, bytes]:
+        """Fetch a response, serving long-lived reference data from the disk cache
+        
+        Expired entries are revalidated with If-None-Match / If-Modified-Since,
+        so an unchanged resource costs a 304 instead of a full body. If
+        revalidation fails (429, 5xx, transport error, open breaker) the stale
+        body is served and kept. The cache's SQLite reads and writes run in a
+        worker thread, off the loop.
+        """
+        ttl = disk_cache_ttl(endpoint)
+        disk = self.get_disk_cache() if ttl is not None else None
+        if disk is None:
+            return await self._get(endpoint, params, raw)
+        
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        # (body, etag, last_modified, expires_at)
+        entry = await asyncio.to_thread(disk.get, digest)
+        headers = None
+        if isinstance(entry, tuple):
+            body, etag, last_modified, expires_at = entry
+            if expires_at > time.time():
+                return json_loads(body)
+            headers = {}
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        
+        result, response_headers = await self._send(endpoint, params, headers or None)
+        if result is None:
+            # 304 Not Modified: the stored body is still current
+            await asyncio.to_thread(
+                disk.set, digest, (body, etag, last_modified, time.time() + ttl)
+            )
+            return json_loads(body)
+        
+        if "error" in result:
+            if isinstance(entry, tuple):
+                # Stale reference data beats an error while BDL is unavailable
+                logger.warning("Serving stale %s after failed revalidation", endpoint)
+                return json_loads(body)
+            return result
+        
+        await asyncio.to_thread(disk.set, digest, (
+            json_dumps(result, indent=False),
+            response_headers.get("ETag"),
+            response_headers.get("Last-Modified"),
+            time.time() + ttl,
+        ))
+        return result
+    
+    def _remember(
+        self,
+        key: tuple,
+        ttl: Optional[float],
+        result: Union[dict, bytes]
+    ) -> Union[dict, bytes]:
+        """Cache a successful response for ttl seconds and return it
+        
+        Raw bytes bodies are only ever returned for successful responses.
+        """
+        if ttl is not None and (isinstance(result, bytes) or "error" not in result):
+            self._cache[key] = (time.monotonic() + ttl, result)
+            if len(self._cache) > CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+        return result
+    
+    async def _get(self, endpoint: str, params: dict, raw: bool = False) -> Union[dict, bytes]:
+        """Send a GET request and decode the JSON response"""
+        result, _ = await self._send(endpoint, params, raw=raw)
+        return result
+    
+    async def _send(
+        self,
+        endpoint: str,
+        params: dict,
+        headers: Optional[dict] = None,
+        raw: bool = False
+    ) -> tuple[Union[dict, bytes, None], Optional[httpx.Headers]]:
+        """Send a GET request, returning the decoded JSON and response headers
+        
+        A 304 Not Modified reply to a conditional request yields no result;
+        with raw=True the body is returned as bytes without decoding.
+        A 429 reply is retried after its Retry-After delay. While the
+        circuit breaker is open no request is sent at all.
+        """
+        if not self._breaker.allow():
+            return UPSTREAM_UNAVAILABLE, None
         
         url = f"{self.base_url}{endpoint}"
         
-        logger.info(f"Request: {url}?{urlencode(params)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Request: %s?%s", url, urlencode(params, doseq=True))
         
         try:
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            attempt = 0
+            while True:
+                # Pace requests below every BDL quota window
+                for bucket in self._buckets_for(endpoint):
+                    await bucket.acquire()
+                
+                # Read the body chunk by chunk into one buffer as it arrives
+                async with self._semaphore, self.get_client().stream(
+                    "GET", url, params=params, headers=headers
+                ) as response:
+                    if not self._protocol_logged:
+                        # Confirms whether ALPN negotiated HTTP/2 with BDL
+                        logger.info("BDL connection protocol: %s", response.http_version)
+                        self._protocol_logged = True
+                    if headers and response.status_code == 304:
+                        self._breaker.record_success()
+                        return None, response.headers
+                    delay = None
+                    if response.status_code == 429 and attempt < RATE_LIMIT_RETRIES:
+                        delay = retry_after(response.headers)
+                    if delay is None or delay > RETRY_AFTER_MAX:
+                        response.raise_for_status()
+                        body = bytearray()
+                        async for chunk in response.aiter_bytes():
+                            body += chunk
+                        break
+                # Over quota: wait as long as BDL asks, then try again
+                logger.warning("BDL rate limit hit, retrying %s in %.1f s", endpoint, delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+            self._breaker.record_success()
+            if raw:
+                return bytes(body), response.headers
+            # Parsed inline: neither orjson nor json releases the GIL, so a
+            # worker thread would not keep the event loop any more responsive
+            return json_loads(body), response.headers
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error: {e}")
-            return {"error": str(e), "status_code": e.response.status_code}
+            # 4xx replies mean BDL is up; only server errors count as outages
+            # and a 429 says nothing about availability either way
+            if e.response.status_code >= 500:
+                self._breaker.record_failure()
+            elif e.response.status_code != 429:
+                self._breaker.record_success()
+            return {"error": str(e), "status_code": e.response.status_code}, None
         except Exception as e:
             logger.error(f"Request error: {e}")
-            return {"error": str(e)}
+            if isinstance(e, httpx.RequestError):
+                self._breaker.record_failure()
+            return {"error": str(e)}, None
 
 
 # Global client instance
@@ -90,7 +555,8 @@ bdl_client = BDLClient()
 # Tool Definitions
 # ============================================================================
 
-TOOLS = [
+# Built once at import; immutable so no handler can alter the advertised schemas
+TOOLS: tuple[Tool, ...] = (
     # Aggregates
     Tool(
         name="get_aggregates",
@@ -707,219 +1173,189 @@ TOOLS = [
             "required": ["id"]
         }
     ),
-]
+)
 
 
 # ============================================================================
 # Tool Handlers
 # ============================================================================
 
-async def handle_get_aggregates(arguments: dict) -> dict:
-    params = {
-        "sort": arguments.get("sort"),
-    }
-    return await bdl_client.request("/aggregates", params, arguments.get("lang"))
-
-
-async def handle_get_aggregate_by_id(arguments: dict) -> dict:
-    aggregate_id = arguments["id"]
-    return await bdl_client.request(f"/aggregates/{aggregate_id}", lang=arguments.get("lang"))
-
-
-async def handle_get_attributes(arguments: dict) -> dict:
-    params = {
-        "sort": arguments.get("sort"),
-    }
-    return await bdl_client.request("/attributes", params, arguments.get("lang"))
-
-
-async def handle_get_attribute_by_id(arguments: dict) -> dict:
-    attr_id = arguments["id"]
-    return await bdl_client.request(f"/attributes/{attr_id}", lang=arguments.get("lang"))
-
-
-async def handle_get_data_by_variable(arguments: dict) -> dict:
-    var_id = arguments["var_id"]
-    params = {
-        "unit-id": arguments.get("unit_id"),
-        "unit-level": arguments.get("unit_level"),
-        "aggregate-id": arguments.get("aggregate_id"),
-        "year": arguments.get("year"),
-        "page": arguments.get("page"),
-        "page-size": arguments.get("page_size"),
-    }
-    return await bdl_client.request(f"/data/by-variable/{var_id}", params, arguments.get("lang"))
-
-
-async def handle_get_data_by_unit(arguments: dict) -> dict:
-    unit_id = arguments["unit_id"]
-    params = {
-        "var-id": arguments["var_id"],
-        "year": arguments.get("year"),
-        "aggregate-id": arguments.get("aggregate_id"),
-        "page": arguments.get("page"),
-        "page-size": arguments.get("page_size"),
-    }
-    return await bdl_client.request(f"/data/by-unit/{unit_id}", params, arguments.get("lang"))
-
-
-async def handle_get_data_localities_by_unit(arguments: dict) -> dict:
-    unit_id = arguments["unit_id"]
-    params = {
-        "var-id": arguments["var_id"],
-        "year": arguments.get("year"),
-        "aggregate-id": arguments.get("aggregate_id"),
-        "page": arguments.get("page"),
-        "page-size": arguments.get("page_size"),
-    }
-    return await bdl_client.request(f"/data/localities/by-unit/{unit_id}", params, arguments.get("lang"))
-
-
-async def handle_get_levels(arguments: dict) -> dict:
-    params = {
-        "sort": arguments.get("sort"),
-    }
-    return await bdl_client.request("/levels", params, arguments.get("lang"))
-
-
-async def handle_get_level_by_id(arguments: dict) -> dict:
-    level_id = arguments["id"]
-    return await bdl_client.request(f"/levels/{level_id}", lang=arguments.get("lang"))
-
-
-async def handle_get_measures(arguments: dict) -> dict:
-    params = {
-        "sort": arguments.get("sort"),
-    }
-    return await bdl_client.request("/measures", params, arguments.get("lang"))
-
-
-async def handle_get_measure_by_id(arguments: dict) -> dict:
-    measure_id = arguments["id"]
-    return await bdl_client.request(f"/measures/{measure_id}", lang=arguments.get("lang"))
-
-
-async def handle_get_subjects(arguments: dict) -> dict:
-    params = {
-        "parent-id": arguments.get("parent_id"),
-        "page": arguments.get("page"),
-        "page-size": arguments.get("page_size"),
-        "sort": arguments.get("sort"),
-    }
-    return await bdl_client.request("/subjects", params, arguments.get("lang"))
-
-
-async def handle_get_subject_by_id(arguments: dict) -> dict:
-    subject_id = arguments["id"]
-    return await bdl_client.request(f"/subjects/{subject_id}", lang=arguments.get("lang"))
-
-
-async def handle_get_units(arguments: dict) -> dict:
-    params = {
-        "parent-id": arguments.get("parent_id"),
-        "level": arguments.get("level"),
-        "name": arguments.get("name"),
-        "year": arguments.get("year"),
-        "kind": arguments.get("kind"),
-        "page": arguments.get("page"),
-        "page-size": arguments.get("page_size"),
-        "sort": arguments.get("sort"),
-    }
-    return await bdl_client.request("/units", params, arguments.get("lang"))
-
-
-async def handle_get_unit_by_id(arguments: dict) -> dict:
-    unit_id = arguments["id"]
-    return await bdl_client.request(f"/units/{unit_id}", lang=arguments.get("lang"))
-
-
-async def handle_search_units(arguments: dict) -> dict:
-    params = {
-        "name": arguments["name"],
-        "level": arguments.get("level"),
-        "year": arguments.get("year"),
-        "page": arguments.get("page"),
-        "page-size": arguments.get("page_size"),
-    }
-    return await bdl_client.request("/units/search", params, arguments.get("lang"))
-
-
-async def handle_get_localities(arguments: dict) -> dict:
-    params = {
-        "parent-id": arguments["parent_id"],
-        "page": arguments.get("page"),
-        "page-size": arguments.get("page_size"),
-    }
-    return await bdl_client.request("/units/localities", params, arguments.get("lang"))
-
-
-async def handle_get_variables(arguments: dict) -> dict:
-    params = {
-        "subject-id": arguments.get("subject_id"),
-        "level": arguments.get("level"),
-        "year": arguments.get("year"),
-        "page": arguments.get("page"),
-        "page-size": arguments.get("page_size"),
-        "sort": arguments.get("sort"),
-    }
-    return await bdl_client.request("/variables", params, arguments.get("lang"))
-
-
-async def handle_get_variable_by_id(arguments: dict) -> dict:
-    var_id = arguments["id"]
-    return await bdl_client.request(f"/variables/{var_id}", lang=arguments.get("lang"))
-
-
-async def handle_search_variables(arguments: dict) -> dict:
-    params = {
-        "subject-id": arguments.get("subject_id"),
-        "name": arguments.get("name"),
-        "level": arguments.get("level"),
-        "year": arguments.get("year"),
-        "page": arguments.get("page"),
-        "page-size": arguments.get("page_size"),
-        "sort": arguments.get("sort"),
-    }
-    return await bdl_client.request("/variables/search", params, arguments.get("lang"))
-
-
-async def handle_get_years(arguments: dict) -> dict:
-    params = {
-        "sort": arguments.get("sort"),
-    }
-    return await bdl_client.request("/years", params, arguments.get("lang"))
+async def request_var_chunks(
+    endpoint: str,
+    params: dict,
+    lang: Optional[str],
+    raw: bool = False
+) -> Union[dict, bytes]:
+    """Fetch data for many variables as concurrent var-id chunks and merge results
+    
+    With raw=True the merged result is encoded as compact JSON bytes too, so
+    the tool returns the same format however many chunks were needed.
+    """
+    var_ids = params["var-id"]
+    if not isinstance(var_ids, list) or len(var_ids) <= VAR_ID_CHUNK_SIZE:
+        return await bdl_client.request(endpoint, params, lang, raw=raw)
+    
+    semaphore = asyncio.Semaphore(VAR_ID_CONCURRENCY)
+    
+    async def fetch_chunk(chunk: list) -> dict:
+        async with semaphore:
+            return await bdl_client.request(endpoint, {**params, "var-id": chunk}, lang)
+    
+    responses = await asyncio.gather(*(
+        fetch_chunk(var_ids[i:i + VAR_ID_CHUNK_SIZE])
+        for i in range(0, len(var_ids), VAR_ID_CHUNK_SIZE)
+    ))
+    for response in responses:
+        if "error" in response:
+            return response
+    
+    merged = dict(responses[0])
+    merged.pop("links", None)
+    merged["results"] = [row for response in responses for row in response.get("results", [])]
+    merged["totalRecords"] = sum(response.get("totalRecords", 0) for response in responses)
+    if raw:
+        return json_dumps(merged, indent=False).encode()
+    return merged
+
+# Endpoint table: tool name -> (path template, required arguments, {argument: query param}).
+# Required arguments fill the %-style path template or are mandatory query parameters.
+ENDPOINTS: dict[str, tuple[str, tuple[str, ...], dict[str, str]]] = {
+    # Aggregates
+    "get_aggregates": ("/aggregates", (), {"sort": "sort"}),
+    "get_aggregate_by_id": ("/aggregates/%(id)s", ("id",), {}),
+    
+    # Attributes
+    "get_attributes": ("/attributes", (), {"sort": "sort"}),
+    "get_attribute_by_id": ("/attributes/%(id)s", ("id",), {}),
+    
+    # Data
+    "get_data_by_variable": ("/data/by-variable/%(var_id)s", ("var_id",), {
+        "unit_id": "unit-id",
+        "unit_level": "unit-level",
+        "aggregate_id": "aggregate-id",
+        "year": "year",
+        "page": "page",
+        "page_size": "page-size",
+    }),
+    "get_data_by_unit": ("/data/by-unit/%(unit_id)s", ("unit_id", "var_id"), {
+        "var_id": "var-id",
+        "year": "year",
+        "aggregate_id": "aggregate-id",
+        "page": "page",
+        "page_size": "page-size",
+    }),
+    "get_data_localities_by_unit": ("/data/localities/by-unit/%(unit_id)s", ("unit_id", "var_id"), {
+        "var_id": "var-id",
+        "year": "year",
+        "aggregate_id": "aggregate-id",
+        "page": "page",
+        "page_size": "page-size",
+    }),
+    
+    # Levels
+    "get_levels": ("/levels", (), {"sort": "sort"}),
+    "get_level_by_id": ("/levels/%(id)s", ("id",), {}),
+    
+    # Measures
+    "get_measures": ("/measures", (), {"sort": "sort"}),
+    "get_measure_by_id": ("/measures/%(id)s", ("id",), {}),
+    
+    # Subjects
+    "get_subjects": ("/subjects", (), {
+        "parent_id": "parent-id",
+        "page": "page",
+        "page_size": "page-size",
+        "sort": "sort",
+    }),
+    "get_subject_by_id": ("/subjects/%(id)s", ("id",), {}),
+    
+    # Units (Territorial)
+    "get_units": ("/units", (), {
+        "parent_id": "parent-id",
+        "level": "level",
+        "name": "name",
+        "year": "year",
+        "kind": "kind",
+        "page": "page",
+        "page_size": "page-size",
+        "sort": "sort",
+    }),
+    "get_unit_by_id": ("/units/%(id)s", ("id",), {}),
+    "search_units": ("/units/search", ("name",), {
+        "name": "name",
+        "level": "level",
+        "year": "year",
+        "page": "page",
+        "page_size": "page-size",
+    }),
+    "get_localities": ("/units/localities", ("parent_id",), {
+        "parent_id": "parent-id",
+        "page": "page",
+        "page_size": "page-size",
+    }),
+    
+    # Variables
+    "get_variables": ("/variables", (), {
+        "subject_id": "subject-id",
+        "level": "level",
+        "year": "year",
+        "page": "page",
+        "page_size": "page-size",
+        "sort": "sort",
+    }),
+    "get_variable_by_id": ("/variables/%(id)s", ("id",), {}),
+    "search_variables": ("/variables/search", (), {
+        "subject_id": "subject-id",
+        "name": "name",
+        "level": "level",
+        "year": "year",
+        "page": "page",
+        "page_size": "page-size",
+        "sort": "sort",
+    }),
+    
+    # Years
+    "get_years": ("/years", (), {"sort": "sort"}),
+    "get_year_by_id": ("/years/%(id)s", ("id",), {}),
+}
 
 
-async def handle_get_year_by_id(arguments: dict) -> dict:
-    year_id = arguments["id"]
-    return await bdl_client.request(f"/years/{year_id}", lang=arguments.get("lang"))
+def make_handler(
+    template: str,
+    required: tuple[str, ...],
+    query: dict[str, str],
+    fetch: Optional[Callable[..., Awaitable[Union[dict, bytes]]]] = None
+):
+    """Build a tool handler that maps tool arguments onto a BDL endpoint
+    
+    Large /data/* responses are passed through as raw JSON bytes instead of
+    being decoded here and re-encoded by call_tool.
+    """
+    has_placeholders = "%(" in template
+    raw = template.startswith("/data/")
+    
+    async def handler(arguments: dict) -> Union[dict, bytes]:
+        # The MCP SDK (>= 1.10, see requirements) validates arguments against
+        # the tool's inputSchema before call_tool runs
+        values = {key: arguments[key] for key in required}
+        params = {
+            param: arguments[arg]
+            for arg, param in query.items()
+            if arguments.get(arg) is not None
+        }
+        request = fetch or bdl_client.request
+        path = template % values if has_placeholders else template
+        return await request(path, params, arguments.get("lang"), raw=raw)
+    
+    return handler
 
 
 # Tool handler mapping
-TOOL_HANDLERS = {
-    "get_aggregates": handle_get_aggregates,
-    "get_aggregate_by_id": handle_get_aggregate_by_id,
-    "get_attributes": handle_get_attributes,
-    "get_attribute_by_id": handle_get_attribute_by_id,
-    "get_data_by_variable": handle_get_data_by_variable,
-    "get_data_by_unit": handle_get_data_by_unit,
-    "get_data_localities_by_unit": handle_get_data_localities_by_unit,
-    "get_levels": handle_get_levels,
-    "get_level_by_id": handle_get_level_by_id,
-    "get_measures": handle_get_measures,
-    "get_measure_by_id": handle_get_measure_by_id,
-    "get_subjects": handle_get_subjects,
-    "get_subject_by_id": handle_get_subject_by_id,
-    "get_units": handle_get_units,
-    "get_unit_by_id": handle_get_unit_by_id,
-    "search_units": handle_search_units,
-    "get_localities": handle_get_localities,
-    "get_variables": handle_get_variables,
-    "get_variable_by_id": handle_get_variable_by_id,
-    "search_variables": handle_search_variables,
-    "get_years": handle_get_years,
-    "get_year_by_id": handle_get_year_by_id,
-}
+TOOL_HANDLERS = {name: make_handler(*spec) for name, spec in ENDPOINTS.items()}
+
+# Multi-variable lookups are split into concurrent var-id chunks
+for _name in ("get_data_by_unit", "get_data_localities_by_unit"):
+    TOOL_HANDLERS[_name] = make_handler(*ENDPOINTS[_name], fetch=request_var_chunks)
 
 
 # ============================================================================
@@ -929,31 +1365,36 @@ TOOL_HANDLERS = {
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """List available tools"""
-    return TOOLS
+    # The SDK expects a list; this is a shallow copy of the prebuilt tools
+    return list(TOOLS)
+
+
+# Responses for unknown tool names, reused across repeated discovery probes
+UNKNOWN_TOOL_CACHE_SIZE = 256
+UNKNOWN_TOOL_RESPONSES: dict[str, list[TextContent]] = {}
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls"""
-    if name not in TOOL_HANDLERS:
-        return [TextContent(
-            type="text",
-            text=json.dumps({"error": f"Unknown tool: {name}"}, ensure_ascii=False)
-        )]
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        response = UNKNOWN_TOOL_RESPONSES.get(name)
+        if response is None:
+            response = [error_content(f"Unknown tool: {name}")]
+            if len(UNKNOWN_TOOL_RESPONSES) < UNKNOWN_TOOL_CACHE_SIZE:
+                UNKNOWN_TOOL_RESPONSES[name] = response
+        return response
     
     try:
-        handler = TOOL_HANDLERS[name]
         result = await handler(arguments)
-        return [TextContent(
-            type="text",
-            text=json.dumps(result, ensure_ascii=False, indent=2)
-        )]
+        if isinstance(result, bytes):
+            # Raw BDL JSON is forwarded without a decode/encode round trip
+            return [TextContent(type="text", text=result.decode())]
+        return [text_content(result)]
     except Exception as e:
         logger.error(f"Error calling tool {name}: {e}")
-        return [TextContent(
-            type="text",
-            text=json.dumps({"error": str(e)}, ensure_ascii=False)
-        )]
+        return [error_content(str(e))]
 
 
 # ============================================================================
@@ -964,13 +1405,24 @@ async def main():
     """Run the MCP server"""
     logger.info("Starting BDL MCP Server...")
     
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+    # One pooled HTTP client serves every tool call for the server's lifetime
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+    finally:
+        await bdl_client.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is an optional, faster drop-in event loop; uvloop.run() avoids
+    # the event-loop policy API that install() relies on (deprecated in 3.12+)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -38,38 +38,64 @@ async def run_tests():
         ("get_variables", {"page_size": 3}, "Lista zmiennych (3 pierwsze)"),
     ]
     
+    semaphore = asyncio.Semaphore(8)
+    
+    async def run_one(tool_name: str, args: dict, description: str) -> tuple[bool, list[str]]:
+        """Run a single test case, returning its status and report lines"""
+        lines = [
+            f"\n[TEST] {description}",
+            f"       Tool: {tool_name}",
+            f"       Args: {args}",
+        ]
+        
+        handler = TOOL_HANDLERS.get(tool_name)
+        if not handler:
+            lines.append(f"       ❌ FAILED: Handler not found")
+            return False, lines
+        
+        async with semaphore:
+            result = await handler(args)
+        if isinstance(result, bytes):
+            # /data/* tools pass the raw BDL JSON through
+            result = json.loads(result)
+        
+        if "error" in result:
+            lines.append(f"       ❌ FAILED: {result['error']}")
+            return False, lines
+        
+        # Check for results
+        if "results" in result:
+            count = len(result.get("results", []))
+            total = result.get("totalRecords", "?")
+            lines.append(f"       ✅ PASSED: Received {count} results (total: {total})")
+        else:
+            lines.append(f"       ✅ PASSED: {json.dumps(result, ensure_ascii=False)[:100]}...")
+        return True, lines
+    
+    # Tests are network-bound, so run them concurrently and report in order
+    outcomes = await asyncio.gather(
+        *(run_one(*test) for test in tests),
+        return_exceptions=True
+    )
+    
     passed = 0
     failed = 0
     
-    for tool_name, args, description in tests:
-        print(f"\n[TEST] {description}")
-        print(f"       Tool: {tool_name}")
-        print(f"       Args: {args}")
+    for (tool_name, args, description), outcome in zip(tests, outcomes):
+        # return_exceptions also hands back BaseExceptions such as CancelledError
+        if isinstance(outcome, BaseException):
+            print(f"\n[TEST] {description}")
+            print(f"       Tool: {tool_name}")
+            print(f"       Args: {args}")
+            print(f"       ❌ FAILED: {str(outcome) or type(outcome).__name__}")
+            failed += 1
+            continue
         
-        try:
-            handler = TOOL_HANDLERS.get(tool_name)
-            if handler:
-                result = await handler(args)
-                
-                if "error" in result:
-                    print(f"       ❌ FAILED: {result['error']}")
-                    failed += 1
-                else:
-                    # Check for results
-                    if "results" in result:
-                        count = len(result.get("results", []))
-                        total = result.get("totalRecords", "?")
-                        print(f"       ✅ PASSED: Received {count} results (total: {total})")
-                        passed += 1
-                    else:
-                        print(f"       ✅ PASSED: {json.dumps(result, ensure_ascii=False)[:100]}...")
-                        passed += 1
-            else:
-                print(f"       ❌ FAILED: Handler not found")
-                failed += 1
-                
-        except Exception as e:
-            print(f"       ❌ FAILED: {str(e)}")
+        ok, lines = outcome
+        print("\n".join(lines))
+        if ok:
+            passed += 1
+        else:
             failed += 1
     
     # Summary
@@ -94,6 +120,8 @@ async def test_single_tool(tool_name: str, args: dict):
     
     print(f"Testing {tool_name} with args: {args}")
     result = await handler(args)
+    if isinstance(result, bytes):
+        result = json.loads(result)
     print(json.dumps(result, ensure_ascii=False, indent=2))
     
     await bdl_client.close()
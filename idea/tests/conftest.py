@@ -0,0 +1,39 @@
+"""Shared fixtures for the BDL client tests
+
+Every test talks to an httpx.MockTransport instead of the live BDL API.
+"""
+
+from typing import Callable
+
+import httpx
+import pytest
+import pytest_asyncio
+
+import server
+
+
+@pytest.fixture(autouse=True)
+def isolated_client(monkeypatch, tmp_path):
+    """Keep tests off the shared disk cache and away from real rate limits"""
+    monkeypatch.setattr(server, "DISK_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(server, "RATE_LIMITS", {"": ((1000.0, 1000.0),)})
+
+
+@pytest_asyncio.fixture
+async def make_client(monkeypatch):
+    """Return a factory building a BDLClient served by a mock transport
+    
+    The client also replaces server.bdl_client, so tool handlers use it.
+    """
+    clients = []
+    
+    def factory(handler: Callable) -> server.BDLClient:
+        client = server.BDLClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(server, "bdl_client", client)
+        clients.append(client)
+        return client
+    
+    yield factory
+    for client in clients:
+        await client.close()
@@ -0,0 +1,52 @@
+"""Circuit breaker around BDL requests"""
+
+import httpx
+import pytest
+
+import server
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_threshold_and_recovers(make_client):
+    calls = []
+    status = {"code": 500}
+    
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(status["code"], json={"results": []})
+    
+    client = make_client(handler)
+    for i in range(server.BREAKER_FAILURE_THRESHOLD):
+        result = await client.request(f"/data/by-variable/{i}")
+        assert result["status_code"] == 500
+    assert len(calls) == server.BREAKER_FAILURE_THRESHOLD
+    
+    # Open: fail fast without contacting BDL
+    assert await client.request("/data/by-variable/x") is server.UPSTREAM_UNAVAILABLE
+    assert len(calls) == server.BREAKER_FAILURE_THRESHOLD
+    
+    # Half-open after the cooldown: one successful trial closes the circuit
+    client._breaker.cooldown = 0.0
+    status["code"] = 200
+    assert await client.request("/data/by-variable/y") == {"results": []}
+    assert await client.request("/data/by-variable/z") == {"results": []}
+    assert len(calls) == server.BREAKER_FAILURE_THRESHOLD + 2
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_open_breaker(make_client):
+    client = make_client(lambda request: httpx.Response(404))
+    for i in range(server.BREAKER_FAILURE_THRESHOLD + 1):
+        result = await client.request(f"/data/by-variable/{i}")
+        assert result["status_code"] == 404
+
+
+@pytest.mark.asyncio
+async def test_transport_errors_open_breaker(make_client):
+    def handler(request):
+        raise httpx.ConnectError("unreachable", request=request)
+    
+    client = make_client(handler)
+    for i in range(server.BREAKER_FAILURE_THRESHOLD):
+        assert "unreachable" in (await client.request(f"/data/by-variable/{i}"))["error"]
+    assert await client.request("/data/by-variable/x") is server.UPSTREAM_UNAVAILABLE
@@ -0,0 +1,43 @@
+"""In-memory LRU response cache"""
+
+import httpx
+import pytest
+
+import server
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used(make_client, monkeypatch):
+    monkeypatch.setattr(server, "CACHE_MAX_ENTRIES", 2)
+    calls = []
+    
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"path": request.url.path})
+    
+    client = make_client(handler)
+    await client.request("/units/1")
+    await client.request("/units/2")
+    await client.request("/units/1")  # hit, now most recently used
+    await client.request("/units/3")  # evicts /units/2
+    assert len(client._cache) == 2
+    
+    await client.request("/units/1")
+    assert calls.count("/api/v1/units/1") == 1
+    await client.request("/units/2")
+    assert calls.count("/api/v1/units/2") == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_cache_entry_is_served_again_after_ttl(make_client, monkeypatch):
+    monkeypatch.setitem(server.TOOL_CACHE_TTL, "/units", 0.0)
+    calls = []
+    
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(200, json={})
+    
+    client = make_client(handler)
+    await client.request("/units/1")
+    await client.request("/units/1")
+    assert len(calls) == 2
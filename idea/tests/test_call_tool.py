@@ -0,0 +1,27 @@
+"""Tool dispatch through the MCP request handler"""
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams
+
+import server
+
+
+async def dispatch(name: str, arguments: dict):
+    handler = server.server.request_handlers[CallToolRequest]
+    request = CallToolRequest(
+        method="tools/call",
+        params=CallToolRequestParams(name=name, arguments=arguments),
+    )
+    return (await handler(request)).root
+
+
+@pytest.mark.asyncio
+async def test_sdk_rejects_missing_required_arguments(make_client):
+    def handler(request):
+        raise AssertionError("BDL must not be called")
+    
+    make_client(handler)
+    result = await dispatch("get_unit_by_id", {})
+    
+    assert result.isError
+    assert "'id' is a required property" in result.content[0].text
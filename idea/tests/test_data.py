@@ -0,0 +1,50 @@
+"""Raw passthrough of /data/* responses"""
+
+import json
+
+import httpx
+import pytest
+
+import server
+
+
+@pytest.mark.asyncio
+async def test_raw_result_can_be_cached(make_client, monkeypatch):
+    monkeypatch.setitem(server.TOOL_CACHE_TTL, "/data/", 60.0)
+    calls = []
+    
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(200, content=b'{"results":[]}')
+    
+    client = make_client(handler)
+    first = await client.request("/data/by-variable/1", raw=True)
+    second = await client.request("/data/by-variable/1", raw=True)
+    
+    assert first == second == b'{"results":[]}'
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_chunked_data_is_compact_like_single_request(make_client, monkeypatch):
+    monkeypatch.setattr(server, "VAR_ID_CHUNK_SIZE", 2)
+    
+    def handler(request):
+        var_ids = request.url.params.get_list("var-id")
+        return httpx.Response(200, json={
+            "totalRecords": len(var_ids),
+            "results": [{"id": v} for v in var_ids],
+        })
+    
+    make_client(handler)
+    single = await server.call_tool("get_data_by_unit", {"unit_id": "1", "var_id": ["1"]})
+    merged = await server.call_tool(
+        "get_data_by_unit", {"unit_id": "1", "var_id": ["1", "2", "3"]}
+    )
+    
+    assert "\n" not in single[0].text
+    assert "\n" not in merged[0].text
+    assert json.loads(merged[0].text) == {
+        "totalRecords": 3,
+        "results": [{"id": "1"}, {"id": "2"}, {"id": "3"}],
+    }
@@ -0,0 +1,103 @@
+"""Persistent disk cache for reference data"""
+
+import time
+
+import httpx
+import pytest
+
+import server
+
+pytest.importorskip("diskcache")
+
+
+@pytest.fixture(autouse=True)
+def disk_only(monkeypatch):
+    """Skip the memory cache so every request reaches the disk cache"""
+    monkeypatch.setitem(server.TOOL_CACHE_TTL, "/levels", None)
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_survives_a_new_client(make_client):
+    calls = []
+    
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(200, json={"id": 1})
+    
+    assert await make_client(handler).request("/levels/1") == {"id": 1}
+    # A second client (e.g. after a restart) reads the same cache directory
+    assert await make_client(handler).request("/levels/1") == {"id": 1}
+    assert len(calls) == 1
+
+
+def expire_all(client: server.BDLClient):
+    """Mark every persisted entry as due for revalidation"""
+    disk = client.get_disk_cache()
+    for digest in list(disk):
+        body, etag, last_modified, _ = disk[digest]
+        disk[digest] = (body, etag, last_modified, 0.0)
+
+
+@pytest.mark.asyncio
+async def test_not_modified_extends_disk_entry(make_client):
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"id": 1}, headers={"ETag": '"v1"'})
+    
+    client = make_client(handler)
+    assert await client.request("/levels/1") == {"id": 1}
+    expire_all(client)
+    
+    assert await client.request("/levels/1") == {"id": 1}
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+    disk = client.get_disk_cache()
+    (digest,) = list(disk)
+    assert disk[digest][3] > time.time() + server.DISK_CACHE_TTL["/levels"] - 60
+    
+    # Fresh again: served from disk without contacting BDL
+    assert await client.request("/levels/1") == {"id": 1}
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_body_served_when_revalidation_is_rate_limited(make_client):
+    status = {"code": 200}
+    
+    def handler(request):
+        if status["code"] == 429:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"id": 1}, headers={"ETag": '"v1"'})
+    
+    client = make_client(handler)
+    await client.request("/levels/1")
+    expire_all(client)
+    status["code"] = 429
+    
+    assert await client.request("/levels/1") == {"id": 1}
+    # The stale entry is kept, so it is revalidated again next time
+    disk = client.get_disk_cache()
+    (digest,) = list(disk)
+    assert disk[digest][3] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_stale_body_served_while_breaker_is_open(make_client):
+    calls = []
+    
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(200, json={"id": 1})
+    
+    client = make_client(handler)
+    await client.request("/levels/1")
+    expire_all(client)
+    for _ in range(server.BREAKER_FAILURE_THRESHOLD):
+        client._breaker.record_failure()
+    
+    assert await client.request("/levels/1") == {"id": 1}
+    assert await client.request("/levels/2") is server.UPSTREAM_UNAVAILABLE
+    assert len(calls) == 1
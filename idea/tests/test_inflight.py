@@ -0,0 +1,54 @@
+"""In-flight request deduplication"""
+
+import asyncio
+
+import httpx
+import pytest
+
+import server
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_call(make_client):
+    calls = []
+    
+    async def handler(request):
+        calls.append(request.url)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"results": [1]})
+    
+    client = make_client(handler)
+    results = await asyncio.gather(*(client.request("/units/1") for _ in range(5)))
+    
+    assert results == [{"results": [1]}] * 5
+    assert len(calls) == 1
+    assert client._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_waiters(make_client):
+    started = asyncio.Event()
+    release = asyncio.Event()
+    calls = []
+    
+    async def handler(request):
+        calls.append(request.url)
+        started.set()
+        await release.wait()
+        return httpx.Response(200, json={"results": [{"id": "x"}]})
+    
+    make_client(handler)
+    arguments = {"unit_id": "011212001011", "var_id": ["3643"]}
+    leader = asyncio.create_task(server.call_tool("get_data_by_unit", arguments))
+    await started.wait()
+    follower = asyncio.create_task(server.call_tool("get_data_by_unit", arguments))
+    await asyncio.sleep(0)
+    
+    leader.cancel()
+    release.set()
+    
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    response = await follower
+    assert response[0].text == '{"results":[{"id":"x"}]}'
+    assert len(calls) == 1
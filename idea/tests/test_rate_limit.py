@@ -0,0 +1,100 @@
+"""Token-bucket pacing and 429 handling"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import server
+
+
+@pytest.mark.asyncio
+async def test_bucket_paces_requests_beyond_capacity():
+    bucket = server.TokenBucket(capacity=2, refill_per_sec=20.0)
+    start = time.monotonic()
+    await asyncio.gather(*(bucket.acquire() for _ in range(4)))
+    
+    # Two tokens are available at once; the other two refill at 20/s
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_longest_prefix_buckets_win(monkeypatch):
+    monkeypatch.setattr(server, "RATE_LIMITS", {
+        "": ((5.0, 5.0), (100.0, 100.0 / 900)),
+        "/data/": ((1.0, 1.0),),
+    })
+    client = server.BDLClient()
+    
+    assert client._buckets_for("/data/by-variable/1") is client._buckets["/data/"]
+    assert len(client._buckets_for("/units")) == 2
+
+
+@pytest.mark.asyncio
+async def test_request_takes_a_token_from_every_window(make_client, monkeypatch):
+    monkeypatch.setattr(server, "RATE_LIMITS", {"": ((10.0, 10.0), (3.0, 0.001))})
+    client = make_client(lambda request: httpx.Response(200, json={}))
+    for i in range(3):
+        await client.request(f"/data/by-variable/{i}")
+    
+    # The long window is exhausted although the per-second one is not
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(client.request("/data/by-variable/x"), 0.1)
+    for task in client._inflight.values():
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_request_is_retried_after_delay(make_client):
+    calls = []
+    
+    def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0.1"})
+        return httpx.Response(200, json={"results": []})
+    
+    client = make_client(handler)
+    assert await client.request("/data/by-variable/1") == {"results": []}
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_long_retry_after_is_not_waited_out(make_client):
+    calls = []
+    
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(429, headers={"Retry-After": "3600"})
+    
+    client = make_client(handler)
+    result = await client.request("/data/by-variable/1")
+    
+    assert result["status_code"] == 429
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_persistent_rate_limit_gives_up_and_keeps_breaker_closed(make_client):
+    calls = []
+    
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(429, headers={"Retry-After": "0"})
+    
+    client = make_client(handler)
+    for i in range(server.BREAKER_FAILURE_THRESHOLD):
+        result = await client.request(f"/data/by-variable/{i}")
+        assert result["status_code"] == 429
+    
+    assert len(calls) == server.BREAKER_FAILURE_THRESHOLD * (server.RATE_LIMIT_RETRIES + 1)
+    assert client._breaker.allow()
+
+
+def test_retry_after_parses_seconds_and_dates():
+    assert server.retry_after(httpx.Headers({"Retry-After": "2.5"})) == 2.5
+    assert server.retry_after(httpx.Headers({})) == 1.0
+    date = httpx.Headers({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    assert server.retry_after(date) == 0.0